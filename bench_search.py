@@ -0,0 +1,73 @@
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+from search_index import SearchIndex
+
+
+def build_corpus(count: int, seed: int = 0) -> list[tuple[str, str, str]]:
+    """Generate (host, sender, message) tuples with a skewed vocabulary like real chat."""
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(20000)]
+    # Zipf like weights so a few terms are common and most are rare
+    cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(vocab))))
+    hosts = [f"10.0.0.{i}" for i in range(1, 21)]
+    corpus = []
+    for _ in range(count):
+        host = rng.choice(hosts)
+        sender = rng.choice((host, "me"))
+        words = rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(3, 12))
+        corpus.append((host, sender, " ".join(words)))
+    return corpus
+
+
+def scan(corpus, terms):
+    """Baseline: tokenize every message and check it for every term."""
+    results = []
+    for entry in corpus:
+        words = set(SearchIndex.tokenize(entry[2]))
+        if all(term in words for term in terms):
+            results.append(entry)
+    return results
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chat history search index.")
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages)
+    queries = [["word0"], ["word5", "word17"], ["word123"], ["word2", "word4000"], ["word19999"]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.jsonl")
+        index = SearchIndex(path)
+        _, elapsed = timed(lambda: [index.add(*entry) for entry in corpus])
+        index.close()
+        print(f"add:    {args.messages} messages in {elapsed:.2f}s")
+        # The first load replays the whole history and snapshots the index, later ones read the snapshot
+        index = SearchIndex(path)
+        _, elapsed = timed(index.load)
+        print(f"replay: {args.messages} messages in {elapsed:.2f}s")
+        index = SearchIndex(path)
+        _, elapsed = timed(index.load)
+        print(f"load:   {args.messages} messages in {elapsed:.2f}s")
+
+        for terms in queries:
+            results, indexed = timed(index.search, terms)
+            expected, scanned = timed(scan, corpus, terms)
+            assert results == expected
+            print(f"search {' '.join(terms)!r}: {len(results)} hits, "
+                  f"index {indexed * 1000:.2f}ms, scan {scanned * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ class ChatMenu():
 
     async def start(self):
         """process chat commands."""
-        completer = WordCompleter(['send', 'help', 'exit'], ignore_case=True)
+        completer = WordCompleter(['send', 'search', 'help', 'exit'], ignore_case=True)
         session = PromptSession(
             completer=completer,
             history=FileHistory('.history.txt'),
@@ -58,6 +58,8 @@ class ChatMenu():
                         else:
                             print("Client listener port: ", self.client.listener_port)
                             await self.server.send_message(self.host, self.client.listener_port, Message.MsgID.TEXT.value, words[1])
+                    elif command == "search":
+                        await self.do_search(words)
                     elif command == "help":
                         self.do_help()
                     elif command == "exit":
@@ -87,6 +89,18 @@ class ChatMenu():
         message = arg[1]
         print(f"Sending message: {message}")
 
+    async def do_search(self, arg):
+        """Search the history of this chat: search <terms>"""
+        if len(arg) < 2:
+            print("Usage: search <terms>")
+            return
+        results = await self.server.search(arg[1:], host=self.host)
+        if not results:
+            print("No matching messages.")
+            return
+        for _, sender, message in results:
+            print(f"{sender} - {message}")
+
     def do_exit(self):
         """Exit the chat."""
         print("Leaving chat...")
@@ -11,6 +11,7 @@ class Settings(BaseSettings):
         DEBUG: If the messaging app is operating in debug mode or not.
         HOST: The host of the messaging app.
         PORT: The port of the messaging app.
+        SEARCH_INDEX_PATH: The file the searchable chat history is persisted to. Defaults to one file per PORT.
     """
 
     TITLE: str = "Messaging App"
@@ -20,6 +21,7 @@ class Settings(BaseSettings):
     LOG_LEVEL: int = logging.INFO
     KEY_LENGTH: int = 2048
     MAX_MESSAGE_SIZE: int = 1024
+    SEARCH_INDEX_PATH: str | None = None
 
     model_config = SettingsConfigDict(env_file=".env", cli_parse_args=True)
 
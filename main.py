@@ -33,7 +33,7 @@ class MainMenu():
 
         # TODO: Add nested autocomplete for chat to list registered peers to chat with
         completer = WordCompleter(
-            ['list_peers', 'chat', 'exit'], ignore_case=True)
+            ['list_peers', 'chat', 'search', 'exit'], ignore_case=True)
         # TODO: Add history autocompletion to the main menu
         session = PromptSession(
             completer=completer,
@@ -58,6 +58,8 @@ class MainMenu():
                         self.do_help()
                     elif command == "chat":
                         await self.do_chat(words)
+                    elif command == "search":
+                        await self.do_search(words)
                     elif command == "exit":
                         await self.do_exit()
                         break
@@ -103,6 +105,18 @@ class MainMenu():
         chat_menu = ChatMenu(host, self.server)
         await chat_menu.start()
 
+    async def do_search(self, arg):
+        """Search the history of every chat: search <terms>"""
+        if len(arg) < 2:
+            print("Usage: search <terms>")
+            return
+        results = await self.server.search(arg[1:])
+        if not results:
+            print("No matching messages.")
+            return
+        for host, sender, message in results:
+            print(f"[{host}] {sender} - {message}")
+
     async def do_exit(self):
         """Exit the chat application."""
         print("Exiting...")
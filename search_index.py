@@ -0,0 +1,223 @@
+from bisect import bisect_left
+import json
+import logging
+import os
+import re
+import threading
+
+
+class SearchIndex():
+    """Incremental inverted index over the chat history.
+
+    Every stored message gets an increasing id and each of its terms maps to a sorted
+    list of those ids, so a lookup only touches the postings of the queried terms
+    instead of scanning the whole history. Messages are appended to a JSON lines
+    history file as they are added. The postings are persisted next to it in a
+    snapshot that records how much of the history it covers, so loading only has to
+    tokenize the messages appended after the last snapshot.
+    """
+    term_pattern = re.compile(r"\w+")
+    """number of messages replayed from the history before a new snapshot is written"""
+    snapshot_threshold = 1000
+
+    def __init__(self, path: str):
+        """the file the history is appended to"""
+        self.path = path
+        """the file the snapshot of the index is persisted to"""
+        self.snapshot_path = path + ".idx"
+        """list of (host, sender, message) tuples where the index is the message id"""
+        self.messages: list[tuple[str, str, str]] = []
+        """dictionary of terms where the value is the sorted list of message ids containing the term"""
+        self.postings: dict[str, list[int]] = {}
+        """the history file opened for appending, or None until the first message is added"""
+        self.file = None
+        """whether the persisted history has been loaded into the index"""
+        self.loaded = False
+        """guards the history file and the index while load runs in another thread"""
+        self.lock = threading.Lock()
+
+    @classmethod
+    def tokenize(cls, text: str) -> list[str]:
+        """Split text into lower case search terms."""
+        return cls.term_pattern.findall(text.lower())
+
+    def load(self) -> None:
+        """
+        Load the index from the snapshot and the history appended after it.
+
+        Safe to run in a worker thread while messages are added. The bulk of the work
+        builds a private copy of the index and only the final replay of messages added
+        in the meantime holds the lock.
+        """
+        if self.loaded:
+            return
+        messages, postings, offset = self.read_snapshot()
+        snapshot_size = len(messages)
+        offset = self.replay(messages, postings, offset)
+        if len(messages) - snapshot_size >= self.snapshot_threshold:
+            self.write_snapshot(messages, postings, offset)
+        with self.lock:
+            if self.loaded:
+                return
+            self.replay(messages, postings, offset)
+            self.messages, self.postings = messages, postings
+            self.loaded = True
+        logging.debug("Loaded %s messages from %s", len(self.messages), self.path)
+
+    def read_snapshot(self) -> tuple[list[tuple[str, str, str]], dict[str, list[int]], int]:
+        """
+        Read the persisted snapshot of the index.
+
+        RETURN: The snapshot's messages, postings and the history offset it covers. An
+        empty index at offset 0 if there is no usable snapshot.
+        """
+        if not os.path.exists(self.snapshot_path):
+            return [], {}, 0
+        try:
+            # One small document per line keeps each decode short, so a loader thread
+            # regularly gives the event loop a turn instead of holding it for one huge load
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                offset, message_count, term_count = header["offset"], header["messages"], header["terms"]
+                messages = [tuple(json.loads(f.readline())) for _ in range(message_count)]
+                postings = {}
+                for _ in range(term_count):
+                    term, ids = json.loads(f.readline())
+                    postings[term] = ids
+            # A history file shorter than the snapshot has been replaced, so the snapshot is stale
+            if not isinstance(offset, int) or offset > os.path.getsize(self.path):
+                raise ValueError("snapshot does not match the history")
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logging.debug("Ignoring invalid search index snapshot %s: %s", self.snapshot_path, e)
+            return [], {}, 0
+        return messages, postings, offset
+
+    def write_snapshot(self, messages: list[tuple[str, str, str]], postings: dict[str, list[int]], offset: int) -> None:
+        """Atomically persist a snapshot of the index covering the history up to offset."""
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                header = {"offset": offset, "messages": len(messages), "terms": len(postings)}
+                f.write(json.dumps(header) + "\n")
+                for entry in messages:
+                    f.write(json.dumps(entry) + "\n")
+                for term, ids in postings.items():
+                    f.write(json.dumps([term, ids]) + "\n")
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logging.debug("Failed to write search index snapshot %s: %s", self.snapshot_path, e)
+
+    def replay(self, messages: list[tuple[str, str, str]], postings: dict[str, list[int]], offset: int) -> int:
+        """
+        Index the history entries after offset into messages and postings.
+
+        A last line without its newline is still being written or was truncated by a
+        crash, so it is left for the next replay.
+
+        RETURN: The offset of the end of the last complete entry.
+        """
+        if not os.path.exists(self.path):
+            return offset
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    host, sender, message = json.loads(line)
+                    if not all(isinstance(field, str) for field in (host, sender, message)):
+                        raise ValueError("expected (host, sender, message) strings")
+                except (ValueError, TypeError) as e:
+                    logging.debug("Skipping invalid history entry in %s: %s", self.path, e)
+                    continue
+                self.index(messages, postings, host, sender, message)
+        return offset
+
+    @classmethod
+    def index(cls, messages: list[tuple[str, str, str]], postings: dict[str, list[int]],
+              host: str, sender: str, message: str) -> int:
+        """Add a message to an in memory index and return its id."""
+        msg_id = len(messages)
+        messages.append((host, sender, message))
+        # Ids only increase, so appending keeps every postings list sorted
+        for term in set(cls.tokenize(message)):
+            postings.setdefault(term, []).append(msg_id)
+        return msg_id
+
+    def add(self, host: str, sender: str, message: str) -> None:
+        """
+        Persist a message to the history file and index it if the history is loaded.
+
+        ARGS:
+            host: ip address of the peer the conversation is with
+            sender: who wrote the message, either the peer's host or "me"
+            message: the plain text message
+        RAISES:
+            OSError: If the history file can't be opened or written.
+        RETURN: None
+        """
+        with self.lock:
+            if self.file is None:
+                # A crash can leave the last entry without its newline. Terminate it so the
+                # next entry starts on its own line instead of being corrupted too.
+                truncated = False
+                if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                    with open(self.path, "rb") as f:
+                        f.seek(-1, os.SEEK_END)
+                        truncated = f.read(1) != b"\n"
+                # History is plain text, so keep it readable by the owner only, even if it already existed
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+                os.fchmod(fd, 0o600)
+                self.file = os.fdopen(fd, "a", encoding="utf-8")
+                if truncated:
+                    self.file.write("\n")
+            self.file.write(json.dumps([host, sender, message]) + "\n")
+            self.file.flush()
+            # An unloaded index picks the message up from the file when it is loaded
+            if self.loaded:
+                self.index(self.messages, self.postings, host, sender, message)
+
+    def search(self, terms: list[str], host: str | None = None) -> list[tuple[str, str, str]]:
+        """
+        Find the messages containing every term.
+
+        ARGS:
+            terms: the words to search for. Matching is case insensitive.
+            host: only return messages from the conversation with this peer
+
+        RETURN: The matching (host, sender, message) tuples, oldest first.
+        """
+        self.load()
+        query = {term for text in terms for term in self.tokenize(text)}
+        if not query:
+            return []
+        postings = []
+        for term in query:
+            ids = self.postings.get(term)
+            if not ids:
+                return []
+            postings.append(ids)
+        # Walk the rarest term and binary search the others for each of its ids
+        postings.sort(key=len)
+        rarest, others = postings[0], postings[1:]
+        results = []
+        for msg_id in rarest:
+            for ids in others:
+                i = bisect_left(ids, msg_id)
+                if i == len(ids) or ids[i] != msg_id:
+                    break
+            else:
+                entry = self.messages[msg_id]
+                if host is None or entry[0] == host:
+                    results.append(entry)
+        return results
+
+    def close(self) -> None:
+        """Close the history file."""
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -8,6 +8,7 @@ import asyncio
 import config
 from client import Client
 from message import Message
+from search_index import SearchIndex
 
 
 class Server():
@@ -31,6 +32,13 @@ class Server():
             self.pub_key.decode(),
             self.port
         )
+        """searchable index of sent and received messages"""
+        # Default to a file per port so peers running from the same directory don't share history
+        self.search_index = SearchIndex(
+            config.get_settings().SEARCH_INDEX_PATH or f".search_index.{self.port}.jsonl"
+        )
+        """task loading the search index off the event loop, started with the server"""
+        self.index_loader: asyncio.Task | None = None
 
     async def register_peer(self, pub_key: str, host: str, port: int) -> None:
         """Register a new client with their public key, host, and listening port."""
@@ -73,6 +81,12 @@ class Server():
                     elif ack_name == Message.AckID.RECEIVED.name:
                         logging.debug("Peer %s:%s successfully received message.",
                             host, listener_port)
+                        # Only keep messages the peer confirmed it received
+                        try:
+                            self.search_index.add(host, "me", message)
+                        except OSError as e:
+                            logging.debug("Failed to save message to %s:%s in the history: %s",
+                                host, listener_port, e)
                     else:
                         logging.debug("Unhandled ack name from %s:%s: %s",
                             host, listener_port, ack_name)
@@ -218,8 +232,12 @@ class Server():
         # Peer is registered. Store the message and send an ack
         # Decrypt the message with the peer's public key before storing
         cipher_rsa = PKCS1_OAEP.new(RSA.import_key(self.priv_key))
-        decrypted_message = cipher_rsa.decrypt(message[1])
-        client.messages.append(decrypted_message.decode())
+        decrypted_message = cipher_rsa.decrypt(message[1]).decode()
+        client.messages.append(decrypted_message)
+        try:
+            self.search_index.add(host, host, decrypted_message)
+        except OSError as e:
+            logging.debug("Failed to save message from %s:%s in the history: %s", host, sender_port, e)
         writer.write(
             Message().write_msg(
                 Message.MsgID.ACK.name,
@@ -268,10 +286,30 @@ class Server():
                     )
 
         logging.debug("Server started, on %s:%s...", self.host, self.port)
+        # Load the search index in a thread so the listener and prompt stay responsive
+        self.index_loader = asyncio.create_task(asyncio.to_thread(self.search_index.load))
+
+    async def search(self, terms: list[str], host: str | None = None) -> list[tuple[str, str, str]]:
+        """
+        Search the message history, waiting for the index to finish loading if needed.
+
+        ARGS:
+            terms: the words to search for
+            host: only return messages from the conversation with this peer
+        RETURN: The matching (host, sender, message) tuples, oldest first.
+        """
+        try:
+            if self.index_loader is not None:
+                await self.index_loader
+            return self.search_index.search(terms, host=host)
+        except OSError as e:
+            logging.debug("Failed to load the message history from %s: %s", self.search_index.path, e)
+            return []
 
     def end(self):
         """Shut down the server and close all client connections."""
         self.listener.close()
+        self.search_index.close()
         logging.debug("Server shut down.")
 
     @classmethod
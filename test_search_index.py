@@ -0,0 +1,125 @@
+import os
+from search_index import SearchIndex
+
+
+def test_search_matches_all_terms_case_insensitively(tmp_path):
+    index = SearchIndex(str(tmp_path / "history.jsonl"))
+    index.add("10.0.0.1", "10.0.0.1", "Hello World")
+    index.add("10.0.0.1", "me", "hello there")
+    index.add("10.0.0.2", "me", "world peace")
+
+    assert index.search(["HELLO"]) == [
+        ("10.0.0.1", "10.0.0.1", "Hello World"),
+        ("10.0.0.1", "me", "hello there"),
+    ]
+    assert index.search(["world", "hello"]) == [("10.0.0.1", "10.0.0.1", "Hello World")]
+    assert index.search(["hello world"]) == [("10.0.0.1", "10.0.0.1", "Hello World")]
+    assert index.search(["missing"]) == []
+    assert index.search(["!!"]) == []
+
+
+def test_search_filters_by_host(tmp_path):
+    index = SearchIndex(str(tmp_path / "history.jsonl"))
+    index.add("10.0.0.1", "me", "meet at noon")
+    index.add("10.0.0.2", "10.0.0.2", "noon works")
+
+    assert index.search(["noon"], host="10.0.0.2") == [("10.0.0.2", "10.0.0.2", "noon works")]
+    assert index.search(["noon"], host="10.0.0.3") == []
+
+
+def test_history_round_trips_through_close(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    index = SearchIndex(path)
+    index.add("10.0.0.1", "me", "first message")
+    index.add("10.0.0.1", "10.0.0.1", "second message")
+    index.close()
+
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    reopened = SearchIndex(path)
+    assert not reopened.loaded
+    assert reopened.search(["message"]) == [
+        ("10.0.0.1", "me", "first message"),
+        ("10.0.0.1", "10.0.0.1", "second message"),
+    ]
+
+
+def test_add_after_load_is_searchable(tmp_path):
+    index = SearchIndex(str(tmp_path / "history.jsonl"))
+    index.add("10.0.0.1", "me", "before load")
+    assert index.search(["load"]) == [("10.0.0.1", "me", "before load")]
+    index.add("10.0.0.1", "me", "after load")
+    assert index.search(["load"]) == [
+        ("10.0.0.1", "me", "before load"),
+        ("10.0.0.1", "me", "after load"),
+    ]
+
+
+def test_load_skips_invalid_entries(tmp_path):
+    path = tmp_path / "history.jsonl"
+    path.write_text(
+        '["10.0.0.1", "me", "good entry"]\n'
+        'not json\n'
+        '5\n'
+        'null\n'
+        '["10.0.0.1", "me"]\n'
+        '["10.0.0.1", "me", 7]\n'
+    )
+    index = SearchIndex(str(path))
+    assert index.search(["entry"]) == [("10.0.0.1", "me", "good entry")]
+    assert len(index.messages) == 1
+
+
+def test_add_terminates_truncated_last_entry(tmp_path):
+    path = tmp_path / "history.jsonl"
+    path.write_text('["10.0.0.1", "me", "complete"]\n["10.0.0.1", "me", "trunc')
+    index = SearchIndex(str(path))
+    index.add("10.0.0.1", "me", "after crash")
+    index.close()
+
+    assert SearchIndex(str(path)).search(["after"]) == [("10.0.0.1", "me", "after crash")]
+
+
+def test_add_restricts_existing_file_to_owner(tmp_path):
+    path = tmp_path / "history.jsonl"
+    path.write_text("")
+    os.chmod(path, 0o644)
+    index = SearchIndex(str(path))
+    index.add("10.0.0.1", "me", "secret")
+    index.close()
+
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_load_uses_snapshot_and_replays_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(SearchIndex, "snapshot_threshold", 2)
+    path = str(tmp_path / "history.jsonl")
+    index = SearchIndex(path)
+    index.add("10.0.0.1", "me", "one")
+    index.add("10.0.0.1", "me", "two")
+    index.close()
+    SearchIndex(path).load()
+    assert os.path.exists(path + ".idx")
+
+    index = SearchIndex(path)
+    index.add("10.0.0.1", "me", "three")
+    index.close()
+    # Only the tail after the snapshot should be tokenized again
+    tokenized = []
+    monkeypatch.setattr(SearchIndex, "tokenize", classmethod(lambda cls, text: tokenized.append(text) or text.split()))
+    reopened = SearchIndex(path)
+    reopened.load()
+    assert tokenized == ["three"]
+    assert [entry[2] for entry in reopened.messages] == ["one", "two", "three"]
+    assert reopened.postings["two"] == [1]
+
+
+def test_load_ignores_stale_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(SearchIndex, "snapshot_threshold", 1)
+    path = tmp_path / "history.jsonl"
+    index = SearchIndex(str(path))
+    index.add("10.0.0.1", "me", "old history")
+    index.close()
+    SearchIndex(str(path)).load()
+
+    path.write_text("")
+    assert SearchIndex(str(path)).search(["old"]) == []
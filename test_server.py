@@ -0,0 +1,91 @@
+import asyncio
+import sys
+import pytest
+import Crypto.Cipher.PKCS1_OAEP as PKCS1_OAEP
+from Crypto.PublicKey import RSA
+import config
+import server as server_module
+from client import Client
+from message import Message
+
+HOST = "10.0.0.1"
+
+
+class StubReader():
+    """Return canned responses from read."""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    async def read(self, n):
+        return self.responses.pop(0)
+
+
+class StubWriter():
+    """Record written bytes for a fixed peer."""
+    def __init__(self, peername=(HOST, 5000)):
+        self.peername = peername
+        self.written = []
+
+    def get_extra_info(self, name):
+        return self.peername
+
+    def write(self, data):
+        self.written.append(data)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    # Settings parse the command line, so hide pytest's arguments from them
+    monkeypatch.setattr(sys, "argv", ["main.py"])
+    monkeypatch.setenv("SEARCH_INDEX_PATH", str(tmp_path / "history.jsonl"))
+    config.get_settings.cache_clear()
+    srv = server_module.Server()
+    yield srv
+    srv.search_index.close()
+    config.get_settings.cache_clear()
+
+
+def test_recv_text_message_indexes_received_message(server):
+    server.clients[HOST] = Client(pub_key=server.pub_key, host=HOST, port=8001)
+    encrypted = PKCS1_OAEP.new(RSA.import_key(server.pub_key)).encrypt(b"hello there")
+    writer = StubWriter()
+
+    asyncio.run(server.recv_text_message(StubReader(), writer, (Message.MsgID.TEXT.name, encrypted)))
+
+    assert server.search_index.search(["hello"]) == [(HOST, HOST, "hello there")]
+    assert writer.written == [Message().write_msg(Message.MsgID.ACK.name, Message.AckID.RECEIVED.value)]
+
+
+@pytest.mark.parametrize("ack, expected", [
+    (Message.AckID.RECEIVED, [(HOST, "me", "hello there")]),
+    (Message.AckID.INVALID, []),
+])
+def test_send_message_indexes_only_received_messages(server, monkeypatch, ack, expected):
+    server.clients[HOST] = Client(pub_key=server.pub_key, host=HOST, port=8001)
+    reader = StubReader(Message().write_msg(Message.MsgID.ACK.name, ack.value))
+
+    async def open_connection(host, port):
+        return reader, StubWriter()
+
+    monkeypatch.setattr(server_module.asyncio, "open_connection", open_connection)
+    asyncio.run(server.send_message(HOST, 8001, Message.MsgID.TEXT.value, "hello there"))
+
+    assert server.search_index.search(["hello"]) == expected
+
+
+def test_history_write_failure_does_not_break_delivery(server, monkeypatch):
+    server.clients[HOST] = Client(pub_key=server.pub_key, host=HOST, port=8001)
+    encrypted = PKCS1_OAEP.new(RSA.import_key(server.pub_key)).encrypt(b"hello there")
+    writer = StubWriter()
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(server.search_index, "add", fail)
+    asyncio.run(server.recv_text_message(StubReader(), writer, (Message.MsgID.TEXT.name, encrypted)))
+
+    assert server.clients[HOST].messages == ["hello there"]
+    assert writer.written == [Message().write_msg(Message.MsgID.ACK.name, Message.AckID.RECEIVED.value)]